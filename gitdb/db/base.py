@@ -6,31 +6,51 @@
 from gitdb.util import (
     join,
     LazyMixin,
-    hex_to_bin
+    hex_to_bin,
+    bin_to_hex
 )
 
-from gitdb.utils.encoding import force_text
+from gitdb.utils.encoding import (
+    force_bytes,
+    force_text
+)
 from gitdb.exc import (
     BadObject,
     AmbiguousObjectName
 )
 
-from itertools import chain
+from abc import (
+    ABC,
+    abstractmethod
+)
+from itertools import (
+    chain,
+    islice
+)
 from functools import reduce
 
 
 __all__ = ('ObjectDBR', 'ObjectDBW', 'FileDBBase', 'CompoundDB', 'CachingDB')
 
+_hex_chars = b'0123456789abcdef'
 
-class ObjectDBR(object):
+
+class ObjectDBR(ABC):
 
     """Defines an interface for object database lookup.
     Objects are identified either by their 20 byte bin sha"""
+    __slots__ = tuple()
+
+    # CONFIGURATION
+    # amount of shas to hand to bulk queries like has_objects at once when
+    # working through iterators of shas
+    max_batch = 256
 
     def __contains__(self, sha):
-        return self.has_obj
+        return self.has_object(sha)
 
     #{ Query Interface
+    @abstractmethod
     def has_object(self, sha):
         """
         Whether the object identified by the given 20 bytes
@@ -38,34 +58,97 @@ class ObjectDBR(object):
 
         :return: True if the object identified by the given 20 bytes
             binary sha is contained in the database"""
-        raise NotImplementedError("To be implemented in subclass")
 
+    def has_objects(self, shas):
+        """
+        Bulk version of ``has_object``, allowing implementations to amortize the
+        lookup overhead over many shas at once
+
+        :param shas: iterable of 20 byte binary shas
+        :return: list of booleans, one for each input sha in input order, True
+            if the respective object is contained in the database"""
+        return [self.has_object(sha) for sha in shas]
+
+    @abstractmethod
     def info(self, sha):
         """ :return: OInfo instance
         :param sha: bytes binary sha
         :raise BadObject:"""
-        raise NotImplementedError("To be implemented in subclass")
 
+    @abstractmethod
     def stream(self, sha):
-        """:return: OStream instance
+        """:return: OStream instance. Its read method should be cheap for small
+            sizes, for instance by reading from a memory map or a buffer
+        :param sha: 20 bytes binary sha
+        :raise BadObject:"""
+
+    def get_bytes(self, sha):
+        """:return: bytes with the uncompressed contents of the object, for when
+            the whole object is needed at once and streaming would just add overhead
         :param sha: 20 bytes binary sha
         :raise BadObject:"""
-        raise NotImplementedError("To be implemented in subclass")
+        return self.stream(sha).read()
+
+    def get_bytes_into(self, sha, buf):
+        """Write the uncompressed contents of the object into the given buffer
 
+        :param sha: 20 bytes binary sha
+        :param buf: writable buffer, like a bytearray or memoryview, which must be
+            at least as large as the object
+        :return: amount of bytes written to buf
+        :raise BadObject:
+        :raise ValueError: if buf is too small"""
+        data = self.get_bytes(sha)
+        if len(data) > len(buf):
+            raise ValueError("Buffer of %i bytes cannot hold object of %i bytes" % (len(buf), len(data)))
+        buf[:len(data)] = data
+        return len(data)
+
+    def stream_many(self, shas, max_inflight=64):
+        """
+        Bulk version of ``stream``, allowing implementations to reorder and batch
+        the underlying reads to make better use of the storage
+
+        :param shas: iterable of 20 byte binary shas
+        :param max_inflight: maximum amount of reads an implementation may have
+            pending at any time, if it reads concurrently. Implementations may
+            choose a lower limit
+        :return: iterator yielding an OStream instance for each input sha, in any order.
+            Streams may hold an open file descriptor until they are read or dropped,
+            so consume them one by one instead of collecting them
+        :raise BadObject:"""
+        return map(self.stream, shas)
+
+    @abstractmethod
     def size(self):
         """:return: amount of objects in this database"""
-        raise NotImplementedError()
 
+    @abstractmethod
     def sha_iter(self):
         """Return iterator yielding 20 byte shas for all objects in this data base"""
-        raise NotImplementedError()
+
+    def sha_iter_batched(self, chunk_shas=4096):
+        """Return iterator yielding bytes of up to chunk_shas concatenated 20 byte
+        shas, covering all objects in this database"""
+        buf = bytearray()
+        for sha in self.sha_iter():
+            buf += sha
+            if len(buf) == chunk_shas * 20:
+                yield bytes(buf)
+                del buf[:]
+            # END yield full chunk
+        # END for each sha
+        if buf:
+            yield bytes(buf)
 
     #} END query interface
 
 
-class ObjectDBW(object):
+class ObjectDBW(ABC):
 
     """Defines an interface to create objects in the database"""
+    # Subclasses keep the stream override in '_ostream'
+    __slots__ = tuple()
 
     def __init__(self, *args, **kwargs):
         self._ostream = None
@@ -76,7 +159,8 @@ class ObjectDBW(object):
         Adjusts the stream to which all data should be sent when storing new objects
 
         :param stream: if not None, the stream to use, if None the default stream
-            will be used.
+            will be used. Objects are written to it in many small pieces, hence
+            it should buffer its writes if they are expensive.
         :return: previously installed stream, or None if there was no override
         :raise TypeError: if the stream doesn't have the supported functionality"""
         cstream = self._ostream
@@ -91,6 +175,7 @@ class ObjectDBW(object):
             if it will write to the default stream"""
         return self._ostream
 
+    @abstractmethod
     def store(self, istream):
         """
         Create a new object in the database
@@ -100,7 +185,6 @@ class ObjectDBW(object):
             to a value, the object will just be stored in the our database format,
             in which case the input stream is expected to be in object format ( header + contents ).
         :raise IOError: if data could not be written"""
-        raise NotImplementedError("To be implemented in subclass")
 
     #} END edit interface
 
@@ -109,6 +193,8 @@ class FileDBBase(object):
 
     """Provides basic facilities to retrieve files of interest, including
     caching facilities to help mapping hexsha's to objects"""
+    # Subclasses keep the root in '_root_path'
+    __slots__ = tuple()
 
     def __init__(self, root_path):
         """Initialize this instance to look for its files at the given root path
@@ -136,6 +222,7 @@ class FileDBBase(object):
 class CachingDB(object):
 
     """A database which uses caches to speed-up access"""
+    __slots__ = tuple()
 
     #{ Interface
     def update_cache(self, force=False):
@@ -150,6 +237,154 @@ class CachingDB(object):
     # END interface
 
 
+def _common_hex_prefix_len(a, b):
+    """:return: amount of leading characters the hexadecimal bytes a and b have in common"""
+    n = min(len(a), len(b))
+    if n == 0 or a[:n].translate(None, _hex_chars) or b[:n].translate(None, _hex_chars):
+        return 0
+    # every differing bit is counted from the right, leaving the equal nibbles on the left
+    return (n * 4 - (int(a[:n], 16) ^ int(b[:n], 16)).bit_length()) // 4
+
+
+class _HexShaTrieNode(object):
+
+    """Node of a _HexShaTrie, reached through the hexadecimal label on its edge"""
+    __slots__ = ('label', 'children', 'binsha', 'count')
+
+    def __init__(self, label, binsha=None):
+        self.label = label              # hex characters on the edge leading to us
+        self.children = dict()          # first byte of child label -> child node
+        self.binsha = binsha            # 20 byte sha if we are a leaf
+        self.count = binsha is not None and 1 or 0  # amount of leaves below us
+
+
+class _HexShaTrie(object):
+
+    """A compressed radix trie over hexadecimal shas, resolving partial hexshas in
+    time proportional to their length instead of the amount of shas.
+
+    Edges carry multi-character labels, and each node knows the amount of shas
+    below it to detect ambiguous names without visiting them.
+
+    The nodes visited by the last lookup are kept, and the next lookup resumes
+    at the deepest of them sharing its prefix, which makes lookups of similar
+    names cheap. Adding shas changes the trie and drops that path."""
+    __slots__ = ('_root', '_last_lookup')
+
+    def __init__(self, binshas=()):
+        self._root = _HexShaTrieNode(b'')
+        # tuple(partial hexsha, list of (depth, node) tuples) of the last lookup. It is
+        # replaced as a whole to keep both consistent with concurrent lookups
+        self._last_lookup = None
+        for binsha in binshas:
+            self.add(binsha)
+        # END for each sha
+
+    def _find(self, partial_hexsha):
+        """:return: deepest node whose path starts with the given partial hexsha
+        :raise BadObject:"""
+        node = self._root
+        pos = 0
+        path = [(0, node)]
+        last_lookup = self._last_lookup
+        if last_lookup is not None:
+            # resume at the deepest node of the previous walk which is still on our way
+            last_partial, last_path = last_lookup
+            common = _common_hex_prefix_len(last_partial, partial_hexsha)
+            for i in range(len(last_path) - 1, -1, -1):
+                depth = last_path[i][0]
+                if depth <= common:
+                    if partial_hexsha[:depth] == last_partial[:depth]:
+                        path = last_path[:i + 1]
+                        pos, node = path[-1]
+                    # END verify resume point
+                    break
+                # END found resume point
+            # END for each previous node
+        # END use previous walk
+
+        end = len(partial_hexsha)
+        while pos < end:
+            node = node.children.get(partial_hexsha[pos])
+            if node is None:
+                raise BadObject(partial_hexsha)
+            label = node.label
+            seg_end = min(end, pos + len(label))
+            if partial_hexsha[pos:seg_end] != label[:seg_end - pos]:
+                raise BadObject(partial_hexsha)
+            pos += len(label)
+            path.append((pos, node))
+        # END walk down
+
+        self._last_lookup = (partial_hexsha, path)
+        return node
+
+    def add(self, binsha):
+        """Add the given 20 byte sha, if it is not yet contained"""
+        hexsha = bin_to_hex(binsha)
+        try:
+            if self._find(hexsha).binsha is not None:
+                return
+        except BadObject:
+            pass
+        # END ignore duplicates
+
+        self._last_lookup = None
+        node = self._root
+        pos = 0
+        while True:
+            node.count += 1
+            child = node.children.get(hexsha[pos])
+            if child is None:
+                node.children[hexsha[pos]] = _HexShaTrieNode(hexsha[pos:], binsha)
+                return
+            # END add leaf
+
+            label = child.label
+            common = 1
+            while common < len(label) and label[common] == hexsha[pos + common]:
+                common += 1
+            # END find common prefix
+            if common < len(label):
+                # split the edge, the next iteration adds our leaf to the new node
+                split = _HexShaTrieNode(label[:common])
+                split.count = child.count
+                child.label = label[common:]
+                split.children[child.label[0]] = child
+                node.children[hexsha[pos]] = split
+                child = split
+            # END split edge
+            node = child
+            pos += common
+        # END walk down
+
+    def partial_to_complete_sha_hex(self, partial_hexsha):
+        """:return: 20 byte binary sha1 matching the given partial hexsha (bytes or str)
+        :raise AmbiguousObjectName:
+        :raise BadObject: """
+        partial_hexsha = force_bytes(partial_hexsha)
+        node = self._find(partial_hexsha)
+        if node.count == 0:
+            raise BadObject(partial_hexsha)
+        if node.count > 1:
+            raise AmbiguousObjectName(partial_hexsha)
+        while node.binsha is None:
+            node = next(iter(node.children.values()))
+        # END descend to single leaf
+        return node.binsha
+
+
+def _batched(iterable, max_batch):
+    """Yield lists of up to max_batch consecutive items of the given iterable"""
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, max_batch))
+        if not batch:
+            return
+        yield batch
+    # END for each batch
+
+
 def _databases_recursive(database, output):
     """Fill output list with database from db, in order. Deals with Loose, Packed
     and compound databases."""
@@ -169,15 +404,38 @@ class CompoundDB(ObjectDBR, LazyMixin, CachingDB):
 
     Databases are stored in the lazy-loaded _dbs attribute.
     Define _set_cache_ to update it with your databases"""
+    # Subclasses keep the lazy '_dbs', '_db_cache', '_db_hits' and '_hit_count' attributes
+    __slots__ = tuple()
+
+    # reorder the databases by their hits every N hits, to ask the ones
+    # containing most of the objects first
+    _sort_interval = 1024
 
     def _set_cache_(self, attr):
         if attr == '_dbs':
             self._dbs = list()
         elif attr == '_db_cache':
             self._db_cache = dict()
+        elif attr == '_db_hits':
+            self._db_hits = dict()
+        elif attr == '_hit_count':
+            self._hit_count = 0
         else:
             super(CompoundDB, self)._set_cache_(attr)
 
+    def _record_hits(self, db, num_hits=1):
+        """Count the objects found in the given database, and resort our databases
+        by their hits once the sort interval was passed"""
+        hits = self._db_hits
+        hits[db] = hits.get(db, 0) + num_hits
+        prev_hit_count = self._hit_count
+        self._hit_count += num_hits
+        if prev_hit_count // self._sort_interval != self._hit_count // self._sort_interval:
+            # assign a new list, lookups iterating the previous one in other threads
+            # keep doing so undisturbed
+            self._dbs = sorted(self._dbs, key=lambda db: hits.get(db, 0), reverse=True)
+        # END resort databases
+
     def _db_query(self, sha):
         """:return: database containing the given 20 byte sha
         :raise BadObject:"""
@@ -192,6 +450,7 @@ class CompoundDB(ObjectDBR, LazyMixin, CachingDB):
         for db in self._dbs:
             if db.has_object(sha):
                 self._db_cache[sha] = db
+                self._record_hits(db)
                 return db
         # END for each database
         raise BadObject(sha)
@@ -206,12 +465,62 @@ class CompoundDB(ObjectDBR, LazyMixin, CachingDB):
             return False
         # END handle exceptions
 
+    def has_objects(self, shas):
+        shas = list(shas)
+        out = [False] * len(shas)
+        db_cache = self._db_cache
+        pending = list()
+        for i, sha in enumerate(shas):
+            if sha in db_cache:
+                out[i] = True
+            else:
+                pending.append(i)
+            # END handle cached
+        # END for each sha
+
+        # ask each database only for what the previous ones didn't have
+        hits = list()
+        for db in self._dbs:
+            if not pending:
+                break
+            missing = list()
+            for i, has in zip(pending, db.has_objects([shas[i] for i in pending])):
+                if has:
+                    out[i] = True
+                    db_cache[shas[i]] = db
+                else:
+                    missing.append(i)
+                # END handle hit
+            # END for each result
+            hits.append((db, len(pending) - len(missing)))
+            pending = missing
+        # END for each database
+
+        # record after the loop, as it may reorder our databases
+        for db, num_hits in hits:
+            self._record_hits(db, num_hits)
+        # END for each database with hits
+        return out
+
     def info(self, sha):
         return self._db_query(sha).info(sha)
 
     def stream(self, sha):
         return self._db_query(sha).stream(sha)
 
+    def get_bytes(self, sha):
+        return self._db_query(sha).get_bytes(sha)
+
+    def stream_many(self, shas, max_inflight=64):
+        # group by database to let each of them batch its own reads
+        shas_by_db = dict()
+        for sha in shas:
+            shas_by_db.setdefault(self._db_query(sha), list()).append(sha)
+        # END for each sha
+        for db, db_shas in shas_by_db.items():
+            yield from db.stream_many(db_shas, max_inflight)
+        # END for each database
+
     def size(self):
         """:return: total size of all contained databases"""
         return reduce(lambda x, y: x + y, (db.size() for db in self._dbs), 0)
@@ -219,6 +528,9 @@ class CompoundDB(ObjectDBR, LazyMixin, CachingDB):
     def sha_iter(self):
         return chain(*(db.sha_iter() for db in self._dbs))
 
+    def sha_iter_batched(self, chunk_shas=4096):
+        return chain(*(db.sha_iter_batched(chunk_shas) for db in self._dbs))
+
     #} END object DBR Interface
 
     #{ Interface
@@ -230,6 +542,8 @@ class CompoundDB(ObjectDBR, LazyMixin, CachingDB):
     def update_cache(self, force=False):
         # something might have changed, clear everything
         self._db_cache.clear()
+        self._db_hits.clear()
+        self._hit_count = 0
         stat = False
         for db in self._dbs:
             if isinstance(db, CachingDB):
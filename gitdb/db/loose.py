@@ -5,13 +5,17 @@
 from gitdb.db.base import (
     FileDBBase,
     ObjectDBR,
-    ObjectDBW
+    ObjectDBW,
+    CachingDB,
+    _HexShaTrie,
+    _hex_chars
 )
 
 
 from gitdb.exc import (
     BadObject,
-    AmbiguousObjectName
+    AmbiguousObjectName,
+    ParseError
 )
 
 from gitdb.stream import (
@@ -43,6 +47,8 @@ from gitdb.util import (
     join
 )
 
+from gitdb.utils.encoding import force_bytes
+
 from gitdb.fun import (
     chunk_size,
     loose_object_header_info,
@@ -50,17 +56,25 @@ from gitdb.fun import (
     stream_copy
 )
 
-from gitdb.utils.encoding import force_bytes
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    as_completed,
+    wait
+)
 
+import errno
 import tempfile
 import os
 import sys
+import time
+import zlib
 
 
 __all__ = ('LooseObjectDB', )
 
 
-class LooseObjectDB(FileDBBase, ObjectDBR, ObjectDBW):
+class LooseObjectDB(FileDBBase, ObjectDBR, ObjectDBW, CachingDB):
 
     """A database which operates on loose object files"""
 
@@ -68,6 +82,13 @@ class LooseObjectDB(FileDBBase, ObjectDBR, ObjectDBW):
     # chunks in which data will be copied between streams
     stream_chunk_size = chunk_size
 
+    # seconds a fanout directory must not have been modified before listing it
+    # to trust its mtime for detecting further changes
+    fanout_mtime_resolution = 2.0
+
+    # amount of threads opening object files concurrently in stream_many
+    stream_many_threads = 8
+
     # On windows we need to keep it writable, otherwise it cannot be removed
     # either
     new_objects_mode = int("444", 8)
@@ -81,6 +102,9 @@ class LooseObjectDB(FileDBBase, ObjectDBR, ObjectDBW):
         # Depending on the root, this might work for some mounts, for others not, which
         # is why it is per instance
         self._fd_open_flags = getattr(os, 'O_NOATIME', 0)
+        # fanout directory (bytes) -> tuple(mtime_ns, is_racy, object file names, _HexShaTrie)
+        # to resolve partial shas, filled on demand
+        self._fanout_cache = dict()
 
     #{ Interface
     def object_path(self, hexsha):
@@ -112,33 +136,108 @@ class LooseObjectDB(FileDBBase, ObjectDBR, ObjectDBW):
         :param name: hexadecimal partial name (bytes or ascii string)
         :raise AmbiguousObjectName:
         :raise BadObject: """
+        partial_hexsha = force_bytes(partial_hexsha)
+        if partial_hexsha.translate(None, _hex_chars):
+            raise BadObject(partial_hexsha)
+        # END handle invalid names
+
+        # only look into the fanout directories which can contain the object
+        if len(partial_hexsha) >= 2:
+            fanouts = (partial_hexsha[:2], )
+        else:
+            fanouts = [partial_hexsha + bytes((c, )) for c in _hex_chars]
+            if not partial_hexsha:
+                fanouts = [f + bytes((c, )) for f in fanouts for c in _hex_chars]
+            # END handle empty name
+        # END get fanouts
+
         candidate = None
-        for binsha in self.sha_iter():
-            if bin_to_hex(binsha).startswith(force_bytes(partial_hexsha)):
-                # it can't ever find the same object twice
-                if candidate is not None:
-                    raise AmbiguousObjectName(partial_hexsha)
-                candidate = binsha
-        # END for each object
+        for fanout in fanouts:
+            trie = self._fanout_index(fanout)[0]
+            if trie is None:
+                continue
+            try:
+                binsha = trie.partial_to_complete_sha_hex(partial_hexsha)
+            except BadObject:
+                continue
+            # END ignore fanouts without match
+            if candidate is not None:
+                raise AmbiguousObjectName(partial_hexsha)
+            candidate = binsha
+        # END for each fanout
         if candidate is None:
             raise BadObject(partial_hexsha)
         return candidate
 
+    def update_cache(self, force=False):
+        """Re-read all fanout directories of our partial sha lookup index which changed
+        on disk, or all of them if force is True
+        :return: True if the objects in any of the directories changed"""
+        changed = False
+        for fanout in list(self._fanout_cache):
+            changed |= self._fanout_index(fanout, force)[1]
+        # END for each known fanout
+        return changed
+
     #} END interface
 
+    def _fanout_index(self, fanout, force=False):
+        """:return: tuple(trie, changed) with the _HexShaTrie of the objects in the given
+            fanout directory, or None if it doesn't exist, and True if the objects changed
+            since we last listed the directory
+        :param fanout: the first two characters of a hexsha as bytes
+        :param force: if True, the directory will be listed even if it appears unchanged"""
+        cached = self._fanout_cache.get(fanout)
+        path = self.db_path(fanout)
+        listed_at = time.time()
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._fanout_cache.pop(fanout, None)
+            return None, cached is not None
+        # END handle missing directory
+
+        # a directory modified within our timestamp resolution of the last listing
+        # may have changed without changing its mtime, hence it is listed again
+        if not force and cached is not None and not cached[1] and cached[0] == st.st_mtime_ns:
+            return cached[3], False
+        # END use cached trie
+
+        try:
+            names = frozenset(f for f in os.listdir(path) if len(f) == 38)
+        except OSError:
+            self._fanout_cache.pop(fanout, None)
+            return None, cached is not None
+        # END handle directory removal
+        if cached is not None and cached[2] == names:
+            trie = cached[3]
+        else:
+            trie = _HexShaTrie(hex_to_bin(fanout + force_bytes(f)) for f in names)
+        # END reuse trie if nothing changed
+        racy = listed_at - st.st_mtime < self.fanout_mtime_resolution
+        self._fanout_cache[fanout] = (st.st_mtime_ns, racy, names, trie)
+        return trie, cached is None or cached[2] != names
+
     def _map_loose_object(self, sha):
         """
         :return: memory map of that file to allow random read access
-        :raise BadObject: if object could not be located"""
+        :raise BadObject: if object could not be located
+        :raise OSError: if no more files can be opened"""
         db_path = self.db_path(self.object_path(bin_to_hex(sha)))
         try:
             return file_contents_ro_filepath(db_path, flags=self._fd_open_flags)
         except OSError as e:
+            if e.errno in (errno.EMFILE, errno.ENFILE):
+                # the object may well exist, we just can't open it right now
+                raise
+            # END handle descriptor exhaustion
             if e.errno != ENOENT:
                 # try again without noatime
                 try:
                     return file_contents_ro_filepath(db_path)
                 except OSError as new_e:
+                    if new_e.errno in (errno.EMFILE, errno.ENFILE):
+                        raise
                     raise BadObject(sha) from new_e
                 # didn't work because of our flag, don't try it again
                 self._fd_open_flags = 0
@@ -168,6 +267,50 @@ class LooseObjectDB(FileDBBase, ObjectDBR, ObjectDBW):
         type, size, stream = DecompressMemMapReader.new(m, close_on_deletion=True)
         return OStream(sha, type, size, stream)
 
+    def get_bytes(self, sha):
+        # decompress all contents at once instead of window by window. The second
+        # decompressor stops right behind the header, so the contents end up in a
+        # single bytes object without being copied again
+        m = self._map_loose_object(sha)
+        try:
+            typ, size = loose_object_header_info(m)
+            zstream = zlib.decompressobj()
+            zstream.decompress(m, len(typ) + len(str(size)) + 2)
+            data = zstream.decompress(zstream.unconsumed_tail)
+        finally:
+            if hasattr(m, 'close'):
+                m.close()
+        # END assure release of system resources
+
+        if len(data) != size:
+            raise ParseError("Object %s has %i bytes of content, but its header specifies %i"
+                             % (bin_to_hex(sha).decode('ascii'), len(data), size))
+        return data
+
+    def stream_many(self, shas, max_inflight=64):
+        # sorted shas visit the fanout directories one after another. Files are
+        # opened in a thread pool, as each of them is a few syscalls we would
+        # otherwise wait for one by one.
+        # Every stream keeps its file descriptor open until it is read or dropped,
+        # hence only as many files are opened ahead of the consumer as there are
+        # threads, to stay clear of the process' file descriptor limit
+        max_inflight = max(1, min(max_inflight, self.stream_many_threads))
+        with ThreadPoolExecutor(self.stream_many_threads) as executor:
+            inflight = set()
+            for sha in sorted(shas):
+                inflight.add(executor.submit(self.stream, sha))
+                if len(inflight) >= max_inflight:
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                    # END for each finished read
+                # END throttle reads
+            # END for each sha
+            for future in as_completed(inflight):
+                yield future.result()
+            # END for each remaining read
+        # END executor
+
     def has_object(self, sha):
         try:
             self.readable_db_object_path(bin_to_hex(sha))
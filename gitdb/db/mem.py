@@ -6,7 +6,8 @@
 from gitdb.db.loose import LooseObjectDB
 from gitdb.db.base import (
     ObjectDBR,
-    ObjectDBW
+    ObjectDBW,
+    _batched
 )
 
 from gitdb.base import (
@@ -93,18 +94,31 @@ class MemoryDB(ObjectDBR, ObjectDBW):
         :return: amount of streams actually copied into odb. If smaller than the amount
             of input shas, one or more objects did already exist in odb"""
         count = 0
-        for sha in sha_iter:
-            if odb.has_object(sha):
-                continue
-            # END check object existence
-
-            ostream = self.stream(sha)
-            # compressed data including header
-            sio = BytesIO(ostream.stream.data())
-            istream = IStream(ostream.type, ostream.size, sio, sha)
-
-            odb.store(istream)
-            count += 1
-        # END for each sha
+        # target databases not derived from ObjectDBR may only provide has_object
+        max_batch = getattr(odb, 'max_batch', ObjectDBR.max_batch)
+        has_objects = getattr(odb, 'has_objects', None)
+        if has_objects is None:
+            def has_objects(shas):
+                return [odb.has_object(sha) for sha in shas]
+        # END handle missing bulk query
+
+        for shas in _batched(sha_iter, max_batch):
+            copied = set()
+            for sha, exists in zip(shas, has_objects(shas)):
+                # existence was queried before storing the batch, catch duplicates
+                if exists or sha in copied:
+                    continue
+                # END check object existence
+                copied.add(sha)
+
+                ostream = self.stream(sha)
+                # compressed data including header
+                sio = BytesIO(ostream.stream.data())
+                istream = IStream(ostream.type, ostream.size, sio, sha)
+
+                odb.store(istream)
+                count += 1
+            # END for each sha
+        # END for each batch of shas
         return count
     #} END interface
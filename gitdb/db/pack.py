@@ -94,6 +94,38 @@ class PackedDB(FileDBBase, ObjectDBR, CachingDB, LazyMixin):
             return False
         # END exception handling
 
+    def has_objects(self, shas):
+        shas = list(shas)
+        out = [False] * len(shas)
+        # each sha is still bisected on its own, but in sorted order consecutive
+        # lookups touch neighbouring regions of the index. Each pack is only
+        # asked for the shas the previous ones didn't have
+        pending = sorted(range(len(shas)), key=shas.__getitem__)
+        prev_hit_count = self._hit_count
+        for item in self._entities:
+            if not pending:
+                break
+            sha_to_index = item[2]
+            missing = list()
+            for i in pending:
+                if sha_to_index(shas[i]) is None:
+                    missing.append(i)
+                else:
+                    out[i] = True
+                # END handle hit
+            # END for each pending sha
+            num_hits = len(pending) - len(missing)
+            item[0] += num_hits
+            self._hit_count += num_hits
+            pending = missing
+        # END for each item
+
+        # we may have skipped the hit count at which _pack_info would resort
+        if prev_hit_count // self._sort_interval != self._hit_count // self._sort_interval:
+            self._sort_entities()
+        # END resort entities
+        return out
+
     def info(self, sha):
         entity, index = self._pack_info(sha)
         return entity.info_at_index(index)
@@ -102,6 +134,20 @@ class PackedDB(FileDBBase, ObjectDBR, CachingDB, LazyMixin):
         entity, index = self._pack_info(sha)
         return entity.stream_at_index(index)
 
+    def stream_many(self, shas, max_inflight=64):
+        # resolve all shas first, then read each pack front to back
+        indices_by_entity = dict()
+        for sha in shas:
+            entity, index = self._pack_info(sha)
+            indices_by_entity.setdefault(entity, list()).append(index)
+        # END for each sha
+        for entity, indices in indices_by_entity.items():
+            indices.sort(key=entity.index().offset)
+            for index in indices:
+                yield entity.stream_at_index(index)
+            # END for each index
+        # END for each entity
+
     def sha_iter(self):
         for entity in self.entities():
             index = entity.index()
@@ -111,6 +157,16 @@ class PackedDB(FileDBBase, ObjectDBR, CachingDB, LazyMixin):
             # END for each index
         # END for each entity
 
+    def sha_iter_batched(self, chunk_shas=4096):
+        # the shas are stored consecutively in the index already
+        for entity in self.entities():
+            index = entity.index()
+            size = index.size()
+            for i in range(0, size, chunk_shas):
+                yield index.shas(i, min(chunk_shas, size - i))
+            # END for each chunk
+        # END for each entity
+
     def size(self):
         sizes = [item[1].index().size() for item in self._entities]
         return reduce(lambda x, y: x + y, sizes, 0)
@@ -3,6 +3,7 @@
 # This module is part of GitDB and is released under
 # the New BSD License: http://www.opensource.org/licenses/bsd-license.php
 import codecs
+import os
 from gitdb.db.base import (
     CompoundDB,
 )
@@ -31,6 +32,12 @@ class ReferenceDB(CompoundDB):
             super(ReferenceDB, self)._set_cache_(attr)
         # END handle attrs
 
+    @staticmethod
+    def _normalize_path(path):
+        """:return: path of an alternates file line in canonical form, to let different
+            spellings of the same location map to a single database"""
+        return os.path.normpath(path.strip())
+
     def _update_dbs_from_ref_file(self):
         dbcls = self.ObjectDBCls
         if dbcls is None:
@@ -43,7 +50,8 @@ class ReferenceDB(CompoundDB):
         ref_paths = list()
         try:
             with codecs.open(self._ref_file, 'r', encoding="utf-8") as f:
-                ref_paths = [l.strip() for l in f]
+                ref_paths = [self._normalize_path(l) for l in f
+                             if l.strip() and not l.startswith('#')]
         except (OSError, IOError):
             pass
         # END handle alternates
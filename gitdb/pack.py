@@ -293,7 +293,7 @@ class PackIndexFile(LazyMixin):
 
             # SETUP FUNCTIONS
             # setup our functions according to the actual version
-            for fname in ('entry', 'offset', 'sha', 'crc'):
+            for fname in ('entry', 'offset', 'sha', 'shas', 'crc'):
                 setattr(self, fname, getattr(self, "_%s_v%i" % (fname, self._version)))
             # END for each function to initialize
 
@@ -317,6 +317,10 @@ class PackIndexFile(LazyMixin):
         base = 1024 + (i * 24) + 4
         return self._cursor.map()[base:base + 20]
 
+    def _shas_v1(self, i, count):
+        """see ``_shas_v2``"""
+        return b''.join(self._sha_v1(j) for j in range(i, i + count))
+
     def _crc_v1(self, i):
         """unsupported"""
         return 0
@@ -347,6 +351,11 @@ class PackIndexFile(LazyMixin):
         base = self._sha_list_offset + i * 20
         return self._cursor.map()[base:base + 20]
 
+    def _shas_v2(self, i, count):
+        """:return: concatenated 20 byte shas of count entries starting at index i"""
+        base = self._sha_list_offset + i * 20
+        return self._cursor.map()[base:base + count * 20]
+
     def _crc_v2(self, i):
         """:return: 4 bytes crc for the object at index i"""
         return unpack_from(">L", self._cursor.map(), self._crc_list_offset + i * 4)[0]
@@ -20,6 +20,8 @@ from gitdb.fun import (
 
 from gitdb.util import (
     allocate_memory,
+    get_stream_buffer,
+    release_stream_buffer,
     LazyMixin,
     make_sha,
     write,
@@ -643,8 +645,10 @@ class FDCompressedSha1Writer(Sha1Writer):
     data and write it to the file descriptor
 
     **Note:** operates on raw file descriptors
+    **Note:** compressed data is collected in a buffer taken from a shared pool once
+        there is something to write, small objects take a single write when closing
     **Note:** for this to work, you have to use the close-method of this instance"""
-    __slots__ = ("fd", "sha1", "zip")
+    __slots__ = ("fd", "sha1", "zip", "buf", "buflen")
 
     # default exception
     exc = IOError("Failed to write all bytes to filedescriptor")
@@ -653,6 +657,36 @@ class FDCompressedSha1Writer(Sha1Writer):
         super(FDCompressedSha1Writer, self).__init__()
         self.fd = fd
         self.zip = zlib.compressobj(zlib.Z_BEST_SPEED)
+        self.buf = None                 # pooled bytearray, obtained on demand
+        self.buflen = 0                 # amount of bytes used in buf
+
+    def _write_fd(self, data):
+        if write(self.fd, data) != len(data):
+            raise self.exc
+
+    def _buffer(self, cdata):
+        """Buffer the given compressed data, writing it out once the buffer is full"""
+        if not cdata:
+            return
+        if self.buf is None:
+            self.buf = get_stream_buffer()
+        # END obtain buffer
+
+        if self.buflen + len(cdata) > len(self.buf):
+            self._flush_buffer()
+            if len(cdata) >= len(self.buf):
+                self._write_fd(cdata)
+                return
+            # END write large chunks directly
+        # END handle full buffer
+        self.buf[self.buflen:self.buflen + len(cdata)] = cdata
+        self.buflen += len(cdata)
+
+    def _flush_buffer(self):
+        if self.buflen:
+            self._write_fd(memoryview(self.buf)[:self.buflen])
+            self.buflen = 0
+        # END handle buffered data
 
     #{ Stream Interface
 
@@ -660,18 +694,14 @@ class FDCompressedSha1Writer(Sha1Writer):
         """:raise IOError: If not all bytes could be written
         :return: length of incoming data"""
         self.sha1.update(data)
-        cdata = self.zip.compress(data)
-        bytes_written = write(self.fd, cdata)
-
-        if bytes_written != len(cdata):
-            raise self.exc
-
+        self._buffer(self.zip.compress(data))
         return len(data)
 
     def close(self):
-        remainder = self.zip.flush()
-        if write(self.fd, remainder) != len(remainder):
-            raise self.exc
+        self._buffer(self.zip.flush())
+        self._flush_buffer()
+        release_stream_buffer(self.buf)
+        self.buf = None
         return close(self.fd)
 
     #} END stream interface
@@ -50,6 +50,7 @@ class TestDBBase(TestBase):
             new_istream = db.store(istream)
             assert new_istream is istream
             assert db.has_object(istream.binsha)
+            assert istream.binsha in db
 
             info = db.info(istream.binsha)
             assert isinstance(info, OInfo)
@@ -59,12 +60,31 @@ class TestDBBase(TestBase):
             assert isinstance(stream, OStream)
             assert stream.binsha == info.binsha and stream.type == info.type
             assert stream.read() == data
+
+            assert db.get_bytes(istream.binsha) == data
+            buf = bytearray(len(data) + 3)
+            assert db.get_bytes_into(istream.binsha, buf) == len(data)
+            assert buf[:len(data)] == data
+            self.assertRaises(ValueError, db.get_bytes_into, istream.binsha, bytearray(1))
         # END for each item
 
         assert db.size() == null_objs + ni
         shas = list(db.sha_iter())
         assert len(shas) == db.size()
         assert len(shas[0]) == 20
+        assert db.has_objects(shas) == [True] * len(shas)
+
+        chunks = list(db.sha_iter_batched(7))
+        assert b''.join(chunks) == b''.join(shas)
+        assert all(len(c) == 7 * 20 for c in chunks[:-1]) and 0 < len(chunks[-1]) <= 7 * 20
+
+        # consume each stream right away, they may keep files open
+        streamed_shas = list()
+        for stream in db.stream_many(shas, max_inflight=16):
+            streamed_shas.append(stream.binsha)
+            assert stream.read() == db.stream(stream.binsha).read()
+        # END for each stream
+        assert sorted(streamed_shas) == sorted(shas)
 
     def _assert_object_writing(self, db):
         """General tests to verify object writing, compatible to ObjectDBW
@@ -99,11 +119,13 @@ class TestDBBase(TestBase):
 
                     ostream = db.stream(sha)
                     assert ostream.read() == data
+                    assert db.get_bytes(sha) == data
                     assert ostream.type == str_blob_type
                     assert ostream.size == len(data)
                 else:
                     self.assertRaises(BadObject, db.info, sha)
                     self.assertRaises(BadObject, db.stream, sha)
+                    self.assertRaises(BadObject, db.get_bytes, sha)
 
                     # DIRECT STREAM COPY
                     # our data hase been written in object format to the StringIO
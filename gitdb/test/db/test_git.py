@@ -8,10 +8,21 @@ from gitdb.test.db.lib import (
     with_rw_directory
 )
 from gitdb.exc import BadObject
-from gitdb.db import GitDB
-from gitdb.base import OStream, OInfo
+from gitdb.db import (
+    GitDB,
+    CompoundDB,
+    MemoryDB
+)
+from gitdb.base import (
+    OStream,
+    OInfo,
+    IStream
+)
+from gitdb.typ import str_blob_type
 from gitdb.util import bin_to_hex
 
+from io import BytesIO
+
 
 class TestGitDB(TestDBBase):
 
@@ -29,8 +40,14 @@ class TestGitDB(TestDBBase):
         assert gdb.size() >= ni
         sha_list = list(gdb.sha_iter())
         assert len(sha_list) == gdb.size()
+        assert b''.join(gdb.sha_iter_batched()) == b''.join(sha_list)
         sha_list = sha_list[:ni]  # speed up tests ...
 
+        # bulk existence checks across all sub-databases
+        assert gdb.has_objects(sha_list) == [True] * ni
+        assert gdb.has_objects([b'\0' * 20] + sha_list[:1]) == [False, True]
+        assert sorted(s.binsha for s in gdb.stream_many(sha_list)) == sorted(sha_list)
+
         # This is actually a test for compound functionality, but it doesn't
         # have a separate test module
         # test partial shas
@@ -45,6 +62,32 @@ class TestGitDB(TestDBBase):
 
         self.assertRaises(BadObject, gdb.partial_to_complete_sha_hex, "0000")
 
+    def test_lookup_order(self):
+        class MemoryCompoundDB(CompoundDB):
+            def __init__(self, dbs):
+                self._dbs = list(dbs)
+
+        first, second = MemoryDB(), MemoryDB()
+        istreams = list()
+        for data in (b'only in the second database', b'this one as well'):
+            istreams.append(second.store(IStream(str_blob_type, len(data), BytesIO(data))))
+        # END for each object to store
+        cdb = MemoryCompoundDB((first, second))
+        cdb._sort_interval = 2
+
+        # the database serving lookups moves to the front once the interval passed
+        dbs = cdb._dbs
+        assert cdb.info(istreams[0].binsha).size == istreams[0].size
+        assert cdb.databases() == (first, second)
+        assert cdb.has_objects([istreams[1].binsha, b'\0' * 20]) == [True, False]
+        assert cdb.databases() == (second, first)
+
+        # the previous list is left untouched for lookups still iterating it
+        assert dbs == [first, second]
+
+        cdb.update_cache()
+        assert cdb._hit_count == 0 and not cdb._db_hits
+
     @with_rw_directory
     def test_writing(self, path):
         gdb = GitDB(path)
@@ -7,8 +7,20 @@ from gitdb.test.db.lib import (
     with_rw_directory
 )
 from gitdb.db import LooseObjectDB
-from gitdb.exc import BadObject
+from gitdb.exc import (
+    BadObject,
+    AmbiguousObjectName,
+    ParseError
+)
 from gitdb.util import bin_to_hex
+from gitdb.base import IStream
+from gitdb.typ import str_blob_type
+
+from io import BytesIO
+from struct import pack
+
+import os
+import zlib
 
 
 class TestLooseDB(TestDBBase):
@@ -26,6 +38,19 @@ class TestLooseDB(TestDBBase):
 
         assert len(shas) == ldb.size()
 
+        # streams may be produced concurrently, in any order
+        # consume each stream right away, they keep their file open
+        streamed_shas = list()
+        for max_inflight in (1, 64):
+            del streamed_shas[:]
+            for stream in ldb.stream_many(shas, max_inflight=max_inflight):
+                streamed_shas.append(stream.binsha)
+                assert stream.read() == ldb.stream(stream.binsha).read()
+            # END for each stream
+            assert sorted(streamed_shas) == sorted(shas)
+        # END for each limit
+        self.assertRaises(BadObject, list, ldb.stream_many([b'\0' * 20]))
+
         # verify find short object
         long_sha = bin_to_hex(shas[-1])
         for short_sha in (long_sha[:20], long_sha[:5]):
@@ -34,3 +59,58 @@ class TestLooseDB(TestDBBase):
 
         self.assertRaises(BadObject, ldb.partial_to_complete_sha_hex, '0000')
         # raises if no object could be found
+
+        # objects written after the lookup index was built are found as well
+        self._assert_object_writing_simple(ldb)
+        shas = list(ldb.sha_iter())
+        for binsha in shas:
+            hexsha = bin_to_hex(binsha)
+            assert ldb.partial_to_complete_sha_hex(hexsha[:39]) == binsha
+            assert ldb.partial_to_complete_sha_hex(hexsha.decode('ascii')) == binsha
+        # END for each sha
+        self.assertRaises(BadObject, ldb.partial_to_complete_sha_hex, hexsha[:39] + b'x')
+
+        # more objects than possible first characters
+        assert len(shas) > 16
+        self.assertRaises(AmbiguousObjectName, ldb.partial_to_complete_sha_hex, bin_to_hex(shas[0])[:1])
+
+        # objects written by someone else are taken into account, even if
+        # our index of their fanout directory was built already
+        unique_sha = next(s for s in shas if sum(o[:1] == s[:1] for o in shas) == 1)
+        prefix = bin_to_hex(unique_sha)[:2]
+        assert ldb.partial_to_complete_sha_hex(prefix) == unique_sha
+        assert not ldb.update_cache()
+
+        other_ldb = LooseObjectDB(path)
+        i = 0
+        while True:
+            data = pack(">L", i) + b'other'
+            istream = other_ldb.store(IStream(str_blob_type, len(data), BytesIO(data)))
+            i += 1
+            if istream.binsha[:1] == unique_sha[:1]:
+                break
+        # END write until the fanout directory is shared
+        self.assertRaises(AmbiguousObjectName, ldb.partial_to_complete_sha_hex, prefix)
+        assert ldb.partial_to_complete_sha_hex(istream.hexsha) == istream.binsha
+
+        # changes are reported by update_cache, the other writes touched
+        # further directories we know already
+        assert ldb.update_cache()
+        assert not ldb.update_cache()
+        data = b'one more'
+        other_ldb.store(IStream(str_blob_type, len(data), BytesIO(data)))
+        assert ldb.update_cache(force=True)
+
+    @with_rw_directory
+    def test_get_bytes_checks_size(self, path):
+        ldb = LooseObjectDB(path)
+        data = b'contents'
+        istream = ldb.store(IStream(str_blob_type, len(data), BytesIO(data)))
+        assert ldb.get_bytes(istream.binsha) == data
+
+        # a header specifying more bytes than the object has
+        obj_path = ldb.db_path(ldb.object_path(istream.hexsha))
+        os.chmod(obj_path, 0o644)
+        with open(obj_path, 'wb') as fp:
+            fp.write(zlib.compress(b'blob 100\0' + data))
+        self.assertRaises(ParseError, ldb.get_bytes, istream.binsha)
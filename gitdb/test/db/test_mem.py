@@ -11,6 +11,8 @@ from gitdb.db import (
     LooseObjectDB
 )
 
+import os
+
 
 class TestMemoryDB(TestDBBase):
 
@@ -27,8 +29,18 @@ class TestMemoryDB(TestDBBase):
         num_streams_copied = mdb.stream_copy(mdb.sha_iter(), ldb)
         assert num_streams_copied == mdb.size()
 
+        # existing objects are not copied again
+        assert mdb.stream_copy(mdb.sha_iter(), ldb) == 0
+
         assert ldb.size() == mdb.size()
         for sha in mdb.sha_iter():
             assert ldb.has_object(sha)
             assert ldb.stream(sha).read() == mdb.stream(sha).read()
         # END verify objects where copied and are equal
+
+        # duplicate shas are copied once
+        sha = next(iter(mdb.sha_iter()))
+        ldb2 = LooseObjectDB(os.path.join(path, 'other'))
+        os.mkdir(ldb2.root_path())
+        assert mdb.stream_copy([sha, sha], ldb2) == 1
+        assert ldb2.size() == 1
@@ -56,15 +56,39 @@ class TestPackDB(TestDBBase):
         # yet ( or required for now )
         sha_list = list(pdb.sha_iter())
         assert len(sha_list) == pdb.size()
+        assert b''.join(pdb.sha_iter_batched(10)) == b''.join(sha_list)
 
         # hit all packs in random order
         random.shuffle(sha_list)
 
         for sha in sha_list:
+            assert sha in pdb
             pdb.info(sha)
-            pdb.stream(sha)
+            assert pdb.get_bytes(sha) == pdb.stream(sha).read()
         # END for each sha to query
 
+        # bulk existence queries answer in input order
+        assert pdb.has_objects(sha_list) == [True] * len(sha_list)
+        assert pdb.has_objects([b'\0' * 20, sha_list[0]]) == [False, True]
+
+        # bulk hits resort the packs like single ones do
+        pdb._sort_interval = 7
+        pdb._entities[-1][0] += 10 ** 6
+        assert pdb.has_objects(sha_list[:10]) == [True] * 10
+        hits = [item[0] for item in pdb._entities]
+        assert hits == sorted(hits, reverse=True)
+        del pdb._sort_interval
+        assert b'\0' * 20 not in pdb
+
+        # bulk streams come back in pack order
+        streamed_shas = list()
+        for stream in pdb.stream_many(sha_list):
+            streamed_shas.append(stream.binsha)
+        # END for each stream
+        assert sorted(streamed_shas) == sorted(sha_list)
+        assert pdb.get_bytes(sha_list[0]) == next(pdb.stream_many(sha_list[:1])).read()
+        self.assertRaises(BadObject, list, pdb.stream_many([b'\0' * 20]))
+
         # test short finding - be a bit more brutal here
         max_bytes = 19
         min_bytes = 2
@@ -56,3 +56,9 @@ class TestReferenceDB(TestDBBase):
         self.make_alt_file(alt_path, [own_repo_path])
         rdb.update_cache()
         assert len(rdb.databases()) == 1
+
+        # different spellings of the same path, blank lines and comments
+        self.make_alt_file(alt_path, ["# comment", own_repo_path + os.sep, "",
+                                      os.path.join(own_repo_path, '..', 'objects')])
+        rdb.update_cache()
+        assert len(rdb.databases()) == 1
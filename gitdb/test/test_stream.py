@@ -147,6 +147,38 @@ class TestStream(TestBase):
             os.remove(path)
         # END for each os
 
+    def test_compressed_writer_buffering(self):
+        fd, path = tempfile.mkstemp()
+        ostream = FDCompressedSha1Writer(fd)
+        data = make_bytes(10000, randomize=False)
+
+        # small writes are collected until the writer is closed
+        for i in range(0, len(data), 100):
+            ostream.write(data[i:i + 100])
+        # END for each small write
+        assert os.path.getsize(path) == 0
+        ostream.close()
+        assert ostream.buf is None
+
+        with open(path, 'rb') as fp:
+            assert zlib.decompress(fp.read()) == data
+        os.remove(path)
+
+        # incompressible data overflows the buffer in small and large chunks
+        fd, path = tempfile.mkstemp()
+        ostream = FDCompressedSha1Writer(fd)
+        data = make_bytes(300 * 1000, randomize=True)
+        offset = 0
+        for chunk_size in (10, 50000, 100000, 149990):
+            ostream.write(data[offset:offset + chunk_size])
+            offset += chunk_size
+        # END for each chunk
+        ostream.close()
+
+        with open(path, 'rb') as fp:
+            assert zlib.decompress(fp.read()) == data
+        os.remove(path)
+
     def test_decompress_reader_special_case(self):
         odb = LooseObjectDB(fixture_path('objects'))
         mdb = MemoryDB()
@@ -11,7 +11,10 @@ from gitdb.util import (
     to_hex_sha,
     to_bin_sha,
     NULL_HEX_SHA,
-    LockedFD
+    LockedFD,
+    get_stream_buffer,
+    release_stream_buffer,
+    stream_buffer_size
 )
 
 
@@ -22,6 +25,16 @@ class TestUtils(TestBase):
         assert len(to_bin_sha(NULL_HEX_SHA)) == 20
         assert to_hex_sha(to_bin_sha(NULL_HEX_SHA)) == NULL_HEX_SHA.encode("ascii")
 
+    def test_stream_buffer_pool(self):
+        buf = get_stream_buffer()
+        assert len(buf) == stream_buffer_size
+
+        # released buffers are handed out again
+        release_stream_buffer(buf)
+        assert get_stream_buffer() is buf
+        assert get_stream_buffer() is not buf
+        release_stream_buffer(buf)
+
     def _cmp_contents(self, file_path, data):
         # raise if data from file at file_path
         # does not match data string
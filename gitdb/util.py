@@ -5,6 +5,7 @@
 import binascii
 import os
 import mmap
+import queue
 import sys
 import time
 import errno
@@ -160,6 +161,33 @@ def allocate_memory(size):
     # END handle memory allocation
 
 
+# size of buffers handed out by get_stream_buffer
+stream_buffer_size = 64 * 1024
+
+# buffers of streams which don't need them anymore, bounded to limit memory usage
+_stream_buffer_pool = queue.LifoQueue(maxsize=16)
+
+
+def get_stream_buffer():
+    """:return: bytearray of stream_buffer_size bytes, reused from a previous stream
+        if possible. Hand it back using ``release_stream_buffer`` once you are done"""
+    try:
+        return _stream_buffer_pool.get_nowait()
+    except queue.Empty:
+        return bytearray(stream_buffer_size)
+    # END handle empty pool
+
+
+def release_stream_buffer(buf):
+    """Put the given buffer obtained by ``get_stream_buffer`` back into the pool.
+    It is dropped if the pool is full already"""
+    try:
+        _stream_buffer_pool.put_nowait(buf)
+    except queue.Full:
+        pass
+    # END handle full pool
+
+
 def file_contents_ro(fd, stream=False, allow_mmap=True):
     """:return: read-only contents of the file represented by the file descriptor fd
 